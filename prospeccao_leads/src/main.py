@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
-from typing import List
+from typing import Awaitable, Callable, List, Tuple
 
 from src.config import Config
 from src.models import Lead
@@ -13,12 +14,15 @@ from src.scrapers.google_places import GooglePlacesScraper
 from src.scrapers.serpapi import SerpApiScraper
 from src.sheets.google_sheets import GoogleSheetsClient
 
+SearchJob = Tuple[int, Callable[[str, str], Awaitable[List[Lead]]], str, str]
+
 
 class ScraperApp:
     """Orquestra a coleta, deduplicação e envio dos leads."""
 
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, max_workers: int = 5) -> None:
         self.config = config
+        self.max_workers = max_workers
         self.scoring = Scoring()
 
     async def run(self) -> None:
@@ -37,42 +41,42 @@ class ScraperApp:
         existing_phones = sheets_client.get_existing_phones()
         logging.info("%s telefones carregados do Google Sheets.", len(existing_phones))
 
-        leads: List[Lead] = []
         async with GooglePlacesScraper(
             api_key=self.config.google_places_api_key,
             rate_limit_per_second=self.config.rate_limit_per_second,
+            max_workers=self.max_workers,
         ) as google_scraper:
-            tasks = [
-                google_scraper.search(nicho, cidade)
-                for cidade in self.config.cidades
-                for nicho in self.config.nichos
-            ]
-
+            searches = [google_scraper.search]
             if self.config.serpapi_key:
-                serpapi_scraper = SerpApiScraper(api_key=self.config.serpapi_key)
-                tasks.extend(
-                    serpapi_scraper.search(nicho, cidade)
-                    for cidade in self.config.cidades
-                    for nicho in self.config.nichos
+                serpapi_scraper = SerpApiScraper(
+                    api_key=self.config.serpapi_key,
+                    session=google_scraper.session,
                 )
+                searches.append(serpapi_scraper.search)
             else:
                 logging.info("SERPAPI_KEY não configurada. Ignorando SerpAPI.")
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            jobs: asyncio.Queue[SearchJob] = asyncio.Queue()
+            for index, (search, cidade, nicho) in enumerate(
+                itertools.product(searches, self.config.cidades, self.config.nichos)
+            ):
+                jobs.put_nowait((index, search, nicho, cidade))
 
-        for result in results:
-            if isinstance(result, Exception):
-                logging.warning("Erro durante a coleta: %s", result)
-                continue
-            leads.extend(result)
+            # Um slot por busca: os leads seguem a ordem das buscas, e não a
+            # ordem de conclusão, para a deduplicação manter o mesmo lead.
+            results: List[List[Lead]] = [[] for _ in range(jobs.qsize())]
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(min(self.max_workers, jobs.qsize())):
+                    task_group.create_task(self._collect(jobs, results))
+
+        leads: List[Lead] = list(itertools.chain.from_iterable(results))
 
         logging.info("Total de leads coletados: %s", len(leads))
 
         deduplicator = Deduplicator(existing_phones=existing_phones)
         leads = deduplicator.deduplicate(leads)
 
-        for lead in leads:
-            lead.score = self.scoring.calculate(lead)
+        self.scoring.calculate_all(leads)
 
         leads.sort(key=lambda item: item.score, reverse=True)
         sheets_client.append_leads(leads)
@@ -80,9 +84,21 @@ class ScraperApp:
         logging.info(
             "Processo concluído. Leads finais: %s. Score máximo: %s.",
             len(leads),
-            max((lead.score for lead in leads), default=0),
+            leads[0].score if leads else 0,
         )
 
+    @staticmethod
+    async def _collect(
+        jobs: asyncio.Queue[SearchJob], results: List[List[Lead]]
+    ) -> None:
+        """Consome buscas da fila até esvaziá-la, guardando cada resultado."""
+        while not jobs.empty():
+            index, search, nicho, cidade = jobs.get_nowait()
+            try:
+                results[index] = await search(nicho, cidade)
+            except Exception as exc:  # noqa: BLE001
+                logging.warning("Erro durante a coleta: %s", exc)
+
 
 def main() -> None:
     """Ponto de entrada síncrono."""
@@ -3,10 +3,45 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List
+import operator
+import re
 
+_NON_DIGITS = re.compile(r"\D")
 
-@dataclass
+LEAD_FIELDS = (
+    "nome",
+    "nicho",
+    "cidade",
+    "endereco",
+    "telefone",
+    "email",
+    "site",
+    "instagram",
+    "facebook",
+    "rating",
+    "total_reviews",
+    "score",
+    "fonte",
+    "data_coleta",
+    "place_id",
+    "latitude",
+    "longitude",
+)
+# Extrai os valores de um lead na ordem de LEAD_FIELDS (colunas da planilha).
+LEAD_GETTER = operator.attrgetter(*LEAD_FIELDS)
+
+
+def normalize_phone(phone: str | None) -> str | None:
+    """Mantém apenas os dígitos do telefone, sem o DDI 55."""
+    if not phone:
+        return None
+    digits = _NON_DIGITS.sub("", phone)
+    if digits.startswith("55"):
+        digits = digits[2:]
+    return digits
+
+
+@dataclass(slots=True)
 class Lead:
     """Representa um lead coletado das fontes disponíveis."""
 
@@ -29,47 +64,9 @@ class Lead:
     place_id: str | None = None
     latitude: float | None = None
     longitude: float | None = None
+    normalized_phone: str | None = field(init=False, repr=False, compare=False)
+    name_key: str = field(init=False, repr=False, compare=False)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Converte o lead em dicionário para persistência."""
-        return {
-            "nome": self.nome,
-            "nicho": self.nicho,
-            "cidade": self.cidade,
-            "endereco": self.endereco,
-            "telefone": self.telefone,
-            "email": self.email,
-            "site": self.site,
-            "instagram": self.instagram,
-            "facebook": self.facebook,
-            "rating": self.rating,
-            "total_reviews": self.total_reviews,
-            "score": self.score,
-            "fonte": self.fonte,
-            "data_coleta": self.data_coleta,
-            "place_id": self.place_id,
-            "latitude": self.latitude,
-            "longitude": self.longitude,
-        }
-
-    def to_list(self) -> List[Any]:
-        """Converte o lead em lista na ordem esperada pelo Google Sheets."""
-        return [
-            self.nome,
-            self.nicho,
-            self.cidade,
-            self.endereco,
-            self.telefone,
-            self.email,
-            self.site,
-            self.instagram,
-            self.facebook,
-            self.rating,
-            self.total_reviews,
-            self.score,
-            self.fonte,
-            self.data_coleta,
-            self.place_id,
-            self.latitude,
-            self.longitude,
-        ]
+    def __post_init__(self) -> None:
+        self.normalized_phone = normalize_phone(self.telefone)
+        self.name_key = self.nome.lower()
@@ -3,56 +3,83 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from difflib import SequenceMatcher
-from typing import Iterable, List, Set
+from typing import Dict, Iterable, List, Set, Tuple
+import unicodedata
+
+import jellyfish
+from rapidfuzz.distance import Levenshtein
 
 from src.models import Lead
 
 
 @dataclass
 class Deduplicator:
-    """Deduplica leads com base em telefone e similaridade de nome."""
+    """Deduplica leads com base em telefone e similaridade de nome.
+
+    ``existing_phones`` deve conter telefones já normalizados
+    (ver ``normalize_phone``); valores que não são só dígitos são ignorados.
+    """
 
     existing_phones: Set[str]
+    max_distance_ratio: float = 0.2
+    block_size: int = 3
 
     def deduplicate(self, leads: Iterable[Lead]) -> List[Lead]:
         """Remove leads duplicados."""
         deduplicated: List[Lead] = []
         removed = 0
-        normalized_existing = {self._normalize_phone(p) for p in self.existing_phones}
+        # Telefones como int: hash e comparação mais baratos que strings.
+        normalized_existing: Set[int] = {
+            int(phone) for phone in self.existing_phones if phone.isdecimal()
+        }
+        names_by_block: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
 
         for lead in leads:
-            normalized_phone = self._normalize_phone(lead.telefone)
-            if normalized_phone and normalized_phone in normalized_existing:
+            normalized_phone = lead.normalized_phone
+            phone_key = int(normalized_phone) if normalized_phone else None
+            if phone_key is not None and phone_key in normalized_existing:
                 removed += 1
                 continue
 
-            if self._is_similar_name(lead, deduplicated):
+            name = lead.name_key
+            block_name = self._normalize_name(name)
+            phonetic = jellyfish.metaphone(block_name)
+            blocks = [
+                names_by_block.setdefault((lead.cidade, key), [])
+                for key in self._block_keys(block_name)
+            ]
+            if any(self._is_similar_name(name, phonetic, block) for block in blocks):
                 removed += 1
                 continue
 
             deduplicated.append(lead)
-            if normalized_phone:
-                normalized_existing.add(normalized_phone)
+            for block in blocks:
+                block.append((phonetic, name))
+            if phone_key is not None:
+                normalized_existing.add(phone_key)
 
         logging.info("Deduplicação removeu %s leads.", removed)
         return deduplicated
 
     @staticmethod
-    def _normalize_phone(phone: str | None) -> str | None:
-        if not phone:
-            return None
-        digits = "".join(char for char in phone if char.isdigit())
-        if digits.startswith("55"):
-            digits = digits[2:]
-        return digits
+    def _normalize_name(name: str) -> str:
+        """Remove acentos, espaços e pontuação do nome já em minúsculas."""
+        decomposed = unicodedata.normalize("NFKD", name)
+        return "".join(char for char in decomposed if char.isalnum())
 
-    @staticmethod
-    def _is_similar_name(candidate: Lead, leads: Iterable[Lead]) -> bool:
-        for lead in leads:
-            ratio = SequenceMatcher(
-                None, candidate.nome.lower(), lead.nome.lower()
-            ).ratio()
-            if ratio >= 0.8 and candidate.cidade == lead.cidade:
+    def _block_keys(self, block_name: str) -> Set[str]:
+        """Gera as chaves de bloco do nome (prefixo e prefixo deslocado)."""
+        return {block_name[: self.block_size], block_name[1 : self.block_size + 1]}
+
+    def _is_similar_name(
+        self, name: str, phonetic: str, block: Iterable[Tuple[str, str]]
+    ) -> bool:
+        for other_phonetic, other in block:
+            if phonetic != other_phonetic:
+                continue
+            max_dist = int(self.max_distance_ratio * max(len(name), len(other)))
+            if abs(len(name) - len(other)) > max_dist:
+                continue
+            if Levenshtein.distance(name, other, score_cutoff=max_dist) <= max_dist:
                 return True
         return False
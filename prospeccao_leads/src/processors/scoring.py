@@ -2,6 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+import numpy as np
 
 from src.models import Lead
 
@@ -10,35 +13,90 @@ from src.models import Lead
 class Scoring:
     """Calcula o score de um lead."""
 
+    # Pesos compartilhados por ``calculate`` e ``calculate_all``.
+    NO_SITE = 25
+    SOCIAL_WITHOUT_SITE = 20
+    SITE_BUILDER = 15
+    PHONE = 10
+    EMAIL = 15
+    LOW_RATING = 10
+    FEW_REVIEWS = 10
+    PRIORITY_NICHO = 10
+    MAX_SCORE = 100
+
     priority_nichos: tuple[str, ...] = (
         "dentista",
         "clínica estética",
         "clinica estetica",
     )
+    host_markers: tuple[str, ...] = ("wix", "wordpress")
+
+    def __post_init__(self) -> None:
+        self._priority_set = frozenset(n.lower() for n in self.priority_nichos)
 
     def calculate(self, lead: Lead) -> int:
         """Calcula o score do lead (0-100)."""
-        score = 0
-
-        if not lead.site:
-            score += 25
-            if lead.instagram or lead.facebook:
-                score += 20
-        else:
-            if "wix" in lead.site.lower() or "wordpress" in lead.site.lower():
-                score += 15
-
-        if lead.telefone:
-            score += 10
-        if lead.email:
-            score += 15
-
-        if lead.rating is not None and lead.rating < 4.0:
-            score += 10
-        if lead.total_reviews is not None and lead.total_reviews < 10:
-            score += 10
-
-        if lead.nicho.lower() in self.priority_nichos:
-            score += 10
-
-        return min(score, 100)
+        site = lead.site
+        site_lc = site.lower() if site else ""
+        rating = lead.rating
+        total_reviews = lead.total_reviews
+
+        score = (
+            (not site) * self.NO_SITE
+            + (not site and bool(lead.instagram or lead.facebook))
+            * self.SOCIAL_WITHOUT_SITE
+            + any(marker in site_lc for marker in self.host_markers)
+            * self.SITE_BUILDER
+            + bool(lead.telefone) * self.PHONE
+            + bool(lead.email) * self.EMAIL
+            + (rating is not None and rating < 4.0) * self.LOW_RATING
+            + (total_reviews is not None and total_reviews < 10) * self.FEW_REVIEWS
+            + (lead.nicho.lower() in self._priority_set) * self.PRIORITY_NICHO
+        )
+        return min(score, self.MAX_SCORE)
+
+    def calculate_all(self, leads: Sequence[Lead]) -> None:
+        """Calcula e atribui o score de todos os leads de forma vetorizada."""
+        if not leads:
+            return
+        for lead, score in zip(leads, self._scores(leads).tolist()):
+            lead.score = score
+
+    def _scores(self, leads: Sequence[Lead]) -> np.ndarray:
+        count = len(leads)
+
+        def flags(values: Iterable[bool]) -> np.ndarray:
+            return np.fromiter(values, dtype=bool, count=count)
+
+        def numbers(values: Iterable[Any]) -> np.ndarray:
+            return np.fromiter(
+                (np.nan if value is None else value for value in values),
+                dtype=float,
+                count=count,
+            )
+
+        no_site = flags(not lead.site for lead in leads)
+        has_social = flags(bool(lead.instagram or lead.facebook) for lead in leads)
+        on_host = flags(
+            bool(lead.site)
+            and any(marker in lead.site.lower() for marker in self.host_markers)
+            for lead in leads
+        )
+        has_phone = flags(bool(lead.telefone) for lead in leads)
+        has_email = flags(bool(lead.email) for lead in leads)
+        is_priority = flags(lead.nicho.lower() in self._priority_set for lead in leads)
+        ratings = numbers(lead.rating for lead in leads)
+        reviews = numbers(lead.total_reviews for lead in leads)
+
+        # Valores ausentes viram NaN, e comparações com NaN resultam em False.
+        scores = (
+            no_site * self.NO_SITE
+            + (no_site & has_social) * self.SOCIAL_WITHOUT_SITE
+            + on_host * self.SITE_BUILDER
+            + has_phone * self.PHONE
+            + has_email * self.EMAIL
+            + (ratings < 4.0) * self.LOW_RATING
+            + (reviews < 10) * self.FEW_REVIEWS
+            + is_priority * self.PRIORITY_NICHO
+        )
+        return np.minimum(scores, self.MAX_SCORE)
@@ -4,13 +4,37 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 import aiohttp
-from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt
 from tenacity import wait_exponential
 
-from src.models import Lead
+from src.models import Lead, normalize_phone
+
+FIELD_MASK = ",".join(
+    (
+        "places.id",
+        "places.displayName",
+        "places.formattedAddress",
+        "places.internationalPhoneNumber",
+        "places.websiteUri",
+        "places.rating",
+        "places.userRatingCount",
+        "places.location",
+        "places.businessStatus",
+        "nextPageToken",
+    )
+)
+
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Repete apenas falhas transitórias: conexão, timeout, 429 e 5xx."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError))
 
 
 @dataclass
@@ -25,7 +49,14 @@ class GooglePlacesScraper:
         self._session: aiohttp.ClientSession | None = None
         self._semaphore = asyncio.Semaphore(self.max_workers)
         self._rate_lock = asyncio.Lock()
-        self._last_call: float | None = None
+        self._tokens = float(self.max_workers)
+        self._updated_at: float | None = None
+        self._retry = AsyncRetrying(
+            wait=wait_exponential(min=1, max=10),
+            stop=stop_after_attempt(3),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True,
+        )
 
     async def __aenter__(self) -> "GooglePlacesScraper":
         self._session = aiohttp.ClientSession()
@@ -35,65 +66,70 @@ class GooglePlacesScraper:
         if self._session:
             await self._session.close()
 
-    async def _rate_limit(self) -> None:
-        async with self._rate_lock:
-            if self._last_call is None:
-                self._last_call = asyncio.get_event_loop().time()
-                return
-            elapsed = asyncio.get_event_loop().time() - self._last_call
-            wait_time = max(0, (1 / self.rate_limit_per_second) - elapsed)
-            if wait_time:
-                await asyncio.sleep(wait_time)
-            self._last_call = asyncio.get_event_loop().time()
-
-    async def _request(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Sessão HTTP aberta pelo context manager."""
+        if not self._session:
+            raise RuntimeError("Sessão HTTP não inicializada.")
+        return self._session
+
+    async def _wait_for_token(self) -> None:
+        """Token bucket com capacidade de ``max_workers`` requisições."""
+        while True:
+            async with self._rate_lock:
+                now = time.monotonic()
+                if self._updated_at is not None:
+                    elapsed = now - self._updated_at
+                    self._tokens = min(
+                        float(self.max_workers),
+                        self._tokens + elapsed * self.rate_limit_per_second,
+                    )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate_limit_per_second
+            await asyncio.sleep(wait_time)
+
+    async def _request(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         if not self._session:
             raise RuntimeError("Sessão HTTP não inicializada.")
 
-        await self._rate_limit()
-        async with self._session.get(url, params=params, timeout=30) as response:
+        headers = {
+            "X-Goog-Api-Key": self.api_key,
+            "X-Goog-FieldMask": FIELD_MASK,
+        }
+        await self._wait_for_token()
+        async with self._session.post(
+            url, json=payload, headers=headers, timeout=30
+        ) as response:
             response.raise_for_status()
             return await response.json()
 
-    async def _request_with_retry(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        async for attempt in AsyncRetrying(
-            wait=wait_exponential(min=1, max=10),
-            stop=stop_after_attempt(3),
-            retry=retry_if_exception_type(aiohttp.ClientError),
-            reraise=True,
-        ):
+    async def _request_with_retry(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # copy() reaproveita a política, mas isola o estado de cada chamada
+        # concorrente (o iterador do tenacity guarda estado na instância).
+        async for attempt in self._retry.copy():
             with attempt:
-                return await self._request(url, params)
+                return await self._request(url, payload)
         raise RuntimeError("Falha inesperada na requisição.")
 
-    async def _get_place_details(self, place_id: str) -> Dict[str, Any]:
-        url = "https://maps.googleapis.com/maps/api/place/details/json"
-        params = {
-            "place_id": place_id,
-            "fields": "name,formatted_phone_number,website,"
-            "formatted_address,geometry,rating,user_ratings_total,"
-            "business_status",
-            "key": self.api_key,
-        }
-        return await self._request_with_retry(url, params)
-
     async def search(self, nicho: str, cidade: str) -> List[Lead]:
         """Busca leads na Google Places API."""
-        url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        params = {
-            "query": f"{nicho} em {cidade}",
-            "language": "pt-BR",
-            "key": self.api_key,
+        url = "https://places.googleapis.com/v1/places:searchText"
+        payload: Dict[str, Any] = {
+            "textQuery": f"{nicho} em {cidade}",
+            "languageCode": "pt-BR",
         }
         leads: List[Lead] = []
         next_page_token: Optional[str] = None
         while True:
             if next_page_token:
-                params["pagetoken"] = next_page_token
-                await asyncio.sleep(2)
+                payload["pageToken"] = next_page_token
 
-            data = await self._request_with_retry(url, params)
-            results = data.get("results", [])
+            async with self._semaphore:
+                data = await self._request_with_retry(url, payload)
+            results = data.get("places", [])
             logging.info(
                 "Google Places retornou %s resultados para %s/%s.",
                 len(results),
@@ -101,59 +137,43 @@ class GooglePlacesScraper:
                 cidade,
             )
             for item in results:
-                if item.get("business_status") != "OPERATIONAL":
+                if item.get("businessStatus") != "OPERATIONAL":
                     continue
-                place_id = item.get("place_id")
+                place_id = item.get("id")
                 if not place_id:
                     continue
 
-                async with self._semaphore:
-                    details = await self._get_place_details(place_id)
-
-                result = details.get("result", {})
-                if result.get("business_status") != "OPERATIONAL":
-                    continue
-
-                telefone = self._format_phone(result.get("formatted_phone_number"))
+                telefone = self._format_phone(item.get("internationalPhoneNumber"))
                 lead = Lead(
-                    nome=result.get("name") or item.get("name", ""),
+                    nome=item.get("displayName", {}).get("text", ""),
                     nicho=nicho,
                     cidade=cidade,
-                    endereco=result.get("formatted_address")
-                    or item.get("formatted_address"),
+                    endereco=item.get("formattedAddress"),
                     telefone=telefone,
                     email=None,
-                    site=result.get("website"),
+                    site=item.get("websiteUri"),
                     instagram=None,
                     facebook=None,
-                    rating=result.get("rating"),
-                    total_reviews=result.get("user_ratings_total"),
+                    rating=item.get("rating"),
+                    total_reviews=item.get("userRatingCount"),
                     score=0,
                     fonte="google_places",
                     place_id=place_id,
-                    latitude=item.get("geometry", {})
-                    .get("location", {})
-                    .get("lat"),
-                    longitude=item.get("geometry", {})
-                    .get("location", {})
-                    .get("lng"),
+                    latitude=item.get("location", {}).get("latitude"),
+                    longitude=item.get("location", {}).get("longitude"),
                 )
                 leads.append(lead)
                 if len(leads) >= 60:
                     return leads
 
-            next_page_token = data.get("next_page_token")
+            next_page_token = data.get("nextPageToken")
             if not next_page_token:
                 break
         return leads
 
     @staticmethod
     def _format_phone(phone: str | None) -> str | None:
-        if not phone:
-            return None
-        digits = "".join(char for char in phone if char.isdigit())
-        if digits.startswith("55"):
-            digits = digits[2:]
-        if len(digits) >= 10:
+        digits = normalize_phone(phone)
+        if digits and len(digits) >= 10:
             return f"+55{digits}"
         return None
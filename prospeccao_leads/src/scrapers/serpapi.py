@@ -1,36 +1,25 @@
-"""Scraper síncrono encapsulado para SerpAPI com fallback opcional."""
+"""Scraper assíncrono para SerpAPI com fallback opcional."""
 from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
 import logging
-from typing import Any, Dict, List
-from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
-import requests
+import aiohttp
 
-from src.models import Lead
+from src.models import Lead, normalize_phone
 
 
 @dataclass
 class SerpApiScraper:
-    """Scraper para SerpAPI executado em ThreadPoolExecutor."""
+    """Scraper para SerpAPI que reutiliza uma sessão aiohttp existente."""
 
     api_key: str
-    executor: ThreadPoolExecutor | None = None
-
-    def __post_init__(self) -> None:
-        if self.executor is None:
-            self.executor = ThreadPoolExecutor(max_workers=5)
+    session: aiohttp.ClientSession
 
     async def search(self, nicho: str, cidade: str) -> List[Lead]:
         """Busca leads na SerpAPI."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.executor, self._sync_search, nicho, cidade
-        )
-
-    def _sync_search(self, nicho: str, cidade: str) -> List[Lead]:
         url = "https://serpapi.com/search.json"
         params = {
             "engine": "google_maps",
@@ -39,10 +28,10 @@ class SerpApiScraper:
             "api_key": self.api_key,
         }
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as exc:
+            async with self.session.get(url, params=params, timeout=30) as response:
+                response.raise_for_status()
+                data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
             logging.warning("Falha na SerpAPI: %s", exc)
             return []
 
@@ -79,11 +68,7 @@ class SerpApiScraper:
 
     @staticmethod
     def _format_phone(phone: str | None) -> str | None:
-        if not phone:
-            return None
-        digits = "".join(char for char in phone if char.isdigit())
-        if digits.startswith("55"):
-            digits = digits[2:]
-        if len(digits) >= 10:
+        digits = normalize_phone(phone)
+        if digits and len(digits) >= 10:
             return f"+55{digits}"
         return None
@@ -3,12 +3,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import List, Set
+from typing import List, Set, Tuple
 
+from cachetools import TTLCache
 import gspread
+from gspread.utils import absolute_range_name
 from oauth2client.service_account import ServiceAccountCredentials
 
-from src.models import Lead
+from src.models import LEAD_FIELDS, LEAD_GETTER, Lead, normalize_phone
+
+# Header e coluna de telefones por sheet_id, reaproveitados entre chamadas.
+_SNAPSHOT_CACHE: TTLCache = TTLCache(maxsize=32, ttl=300)
 
 
 @dataclass
@@ -20,7 +25,8 @@ class GoogleSheetsClient:
 
     def __post_init__(self) -> None:
         self._client = self._authorize()
-        self._sheet = self._client.open_by_key(self.sheet_id).sheet1
+        self._spreadsheet = self._client.open_by_key(self.sheet_id)
+        self._sheet = self._spreadsheet.sheet1
 
     def _authorize(self) -> gspread.Client:
         scope = [
@@ -32,17 +38,34 @@ class GoogleSheetsClient:
         )
         return gspread.authorize(credentials)
 
+    def _get_snapshot(self) -> Tuple[List[str], List[str]]:
+        """Lê header e telefones em uma única chamada ``values.batchGet``."""
+        cached = _SNAPSHOT_CACHE.get(self.sheet_id)
+        if cached is not None:
+            return cached
+
+        title = self._sheet.title
+        response = self._spreadsheet.values_batch_get(
+            ranges=[
+                absolute_range_name(title, "A1:Q1"),
+                absolute_range_name(title, "E2:E"),
+            ]
+        )
+        header_range, phones_range = response.get("valueRanges", [{}, {}])
+        header = (header_range.get("values") or [[]])[0]
+        phones = [row[0] for row in phones_range.get("values", []) if row and row[0]]
+        snapshot = (header, phones)
+        _SNAPSHOT_CACHE[self.sheet_id] = snapshot
+        return snapshot
+
     def get_existing_phones(self) -> Set[str]:
-        """Obtém os telefones existentes para deduplicação."""
+        """Obtém os telefones existentes, já normalizados, para deduplicação."""
         try:
-            values = self._sheet.col_values(5)
+            _, phones = self._get_snapshot()
         except gspread.exceptions.GSpreadException as exc:
             logging.warning("Falha ao ler telefones existentes: %s", exc)
             return set()
-
-        if not values:
-            return set()
-        return {value for value in values[1:] if value}
+        return {digits for digits in map(normalize_phone, phones) if digits}
 
     def append_leads(self, leads: List[Lead]) -> None:
         """Envia leads para o Google Sheets em batch."""
@@ -50,34 +73,17 @@ class GoogleSheetsClient:
             logging.info("Nenhum lead para enviar ao Google Sheets.")
             return
 
-        header = [
-            "nome",
-            "nicho",
-            "cidade",
-            "endereco",
-            "telefone",
-            "email",
-            "site",
-            "instagram",
-            "facebook",
-            "rating",
-            "total_reviews",
-            "score",
-            "fonte",
-            "data_coleta",
-            "place_id",
-            "latitude",
-            "longitude",
-        ]
+        header = list(LEAD_FIELDS)
 
         try:
-            existing_header = self._sheet.row_values(1)
+            existing_header, _ = self._get_snapshot()
             if not existing_header:
                 self._sheet.append_row(header)
         except gspread.exceptions.GSpreadException as exc:
             logging.warning("Falha ao validar header: %s", exc)
 
-        rows = [lead.to_list() for lead in leads]
+        rows = [list(LEAD_GETTER(lead)) for lead in leads]
+        _SNAPSHOT_CACHE.pop(self.sheet_id, None)
         try:
             self._sheet.append_rows(rows, value_input_option="USER_ENTERED")
             logging.info("%s leads enviados ao Google Sheets.", len(leads))